@@ -0,0 +1,24 @@
+"""pytest 配置：提供锁服务客户端与测试运行器 fixture"""
+
+import pytest
+
+from test_lock_service import LockServiceClient, TestConfig, TestRunner
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: 需要等待心跳间隔或锁过期的测试")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """每个进程（xdist worker）共用一个客户端，服务未启动时跳过全部用例"""
+    client = LockServiceClient(TestConfig())
+    if not client.is_available():
+        pytest.skip(f"无法连接到服务 {client.config.base_url}")
+    return client
+
+
+@pytest.fixture
+def runner(client):
+    """每个用例独立的运行器，保证断言计数互不影响"""
+    return TestRunner(client)
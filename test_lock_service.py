@@ -2,22 +2,63 @@
 """
 分布式锁服务集成测试脚本
 测试三个核心接口：申请锁、心跳、释放锁
+
+运行方式：
+    python test_lock_service.py          # 内置的并行测试运行器
+    pytest -n auto                       # pytest + pytest-xdist 多进程并行
 """
 
+import itertools
+import queue
 import requests
+import socket
+import sys
+import threading
 import time
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
 from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """序列化请求体"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(content: bytes) -> Dict[str, Any]:
+    """解析响应体"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# 不存在的锁，测试5/6 直接发送预先序列化好的请求体
+_INVALID_LOCK_BODY = _dumps({"lock_id": "invalid-lock-id-12345"})
 
 
 @dataclass
 class TestConfig:
     """测试配置"""
+    __test__ = False
+    
     base_url: str = "http://127.0.0.1:8080"
     acquire_endpoint: str = "/api/lock/acquire"
     heartbeat_endpoint: str = "/api/lock/heartbeat"
     release_endpoint: str = "/api/lock/release"
+    # 是否读取环境变量中的代理、CA 证书和 netrc 配置（HTTP(S)_PROXY、NO_PROXY、
+    # REQUESTS_CA_BUNDLE 等）；确认不需要时设为 False，可省去每次请求的环境查找开销
+    trust_env: bool = True
 
 
 class LockServiceClient:
@@ -25,19 +66,66 @@ class LockServiceClient:
     
     def __init__(self, config: TestConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self._acquire_url = config.base_url + config.acquire_endpoint
+        self._heartbeat_url = config.base_url + config.heartbeat_endpoint
+        self._release_url = config.base_url + config.release_endpoint
+        # (连接超时, 读取超时)，服务异常时快速失败而不是无限阻塞
+        self._timeout = (0.5, 3.0)
+        # urllib3 的连接池是线程安全的，所有测试线程共用一个 Session 复用 keep-alive 连接
+        self.session = self._build_session()
     
-    def acquire_lock(
-        self,
+    def is_available(self) -> bool:
+        """检查服务端口是否可连接（只建立 TCP 连接，不发送 HTTP 请求）"""
+        url = urlparse(self.config.base_url)
+        try:
+            port = url.port or (443 if url.scheme == "https" else 80)
+            socket.create_connection((url.hostname, port), timeout=0.5).close()
+        except OSError:
+            return False
+        return True
+    
+    def _build_session(self) -> requests.Session:
+        """创建 Session 并挂载调优后的连接池"""
+        session = requests.Session()
+        session.trust_env = self.config.trust_env
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+        # 只访问一个服务地址；并发请求最多约 16 个（12 个测试线程 + 测试10 的 5 个线程），
+        # 默认的 10 个连接不够用，超出的连接会被丢弃并重新握手
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            # 请求都是 POST，不在 urllib3 默认的可重试方法内，实际只会重试连接失败
+            max_retries=Retry(total=2, connect=2, backoff_factor=0.05),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def _post(self, url: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """发送 JSON 请求并解析响应"""
+        return self._post_raw(url, _dumps(data))
+    
+    def _post_raw(self, url: str, body: bytes) -> Dict[str, Any]:
+        """发送已序列化的请求体并解析响应"""
+        response = self.session.post(url, data=body, timeout=self._timeout)
+        return _loads(response.content)
+    
+    def _post_batch(self, url: str, bodies: List[bytes]) -> List[Dict[str, Any]]:
+        """连续发送多个已序列化的请求（复用连接池中的 keep-alive 连接）"""
+        return [self._post_raw(url, body) for body in bodies]
+    
+    @staticmethod
+    def _acquire_payload(
         namespace: str = None,
         user_id: str = "test_user",
         user_name: str = "测试用户",
         business_id: str = "test_business",
         timeout: int = 60
     ) -> Dict[str, Any]:
-        """申请锁"""
-        url = f"{self.config.base_url}{self.config.acquire_endpoint}"
+        """构造申请锁的请求参数"""
         data = {
             "user_id": user_id,
             "user_name": user_name,
@@ -46,46 +134,163 @@ class LockServiceClient:
         }
         if namespace is not None:
             data["namespace"] = namespace
-            
-        response = self.session.post(url, json=data)
-        return response.json()
+        return data
+    
+    def acquire_lock(
+        self,
+        namespace: str = None,
+        user_id: str = "test_user",
+        user_name: str = "测试用户",
+        business_id: str = "test_business",
+        timeout: int = 60
+    ) -> Dict[str, Any]:
+        """申请锁"""
+        data = self._acquire_payload(namespace, user_id, user_name, business_id, timeout)
+        return self._post(self._acquire_url, data)
+    
+    def acquire_raw(self, body: bytes) -> Dict[str, Any]:
+        """用预先序列化好的请求体申请锁"""
+        return self._post_raw(self._acquire_url, body)
+    
+    def bulk_acquire(self, n: int, **kwargs) -> List[Dict[str, Any]]:
+        """以相同参数连续申请 n 次锁（请求体只序列化一次），参数同 acquire_lock"""
+        body = _dumps(self._acquire_payload(**kwargs))
+        return self._post_batch(self._acquire_url, [body] * n)
     
     def heartbeat(self, lock_id: str) -> Dict[str, Any]:
         """心跳"""
-        url = f"{self.config.base_url}{self.config.heartbeat_endpoint}"
         data = {"lock_id": lock_id}
-        response = self.session.post(url, json=data)
-        return response.json()
+        return self._post(self._heartbeat_url, data)
+    
+    def heartbeat_raw(self, body: bytes) -> Dict[str, Any]:
+        """用预先序列化好的请求体发送心跳"""
+        return self._post_raw(self._heartbeat_url, body)
     
     def release_lock(self, lock_id: str) -> Dict[str, Any]:
         """释放锁"""
-        url = f"{self.config.base_url}{self.config.release_endpoint}"
         data = {"lock_id": lock_id}
-        response = self.session.post(url, json=data)
-        return response.json()
+        return self._post(self._release_url, data)
+    
+    def release_raw(self, body: bytes) -> Dict[str, Any]:
+        """用预先序列化好的请求体释放锁"""
+        return self._post_raw(self._release_url, body)
+
+
+# 测试7 在两个命名空间申请同一业务的锁，请求体在导入时序列化一次
+_NAMESPACE_A_ACQUIRE_BODY = _dumps(LockServiceClient._acquire_payload(
+    namespace="namespace_a",
+    user_name="用户A",
+    business_id="test_7"
+))
+_NAMESPACE_B_ACQUIRE_BODY = _dumps(LockServiceClient._acquire_payload(
+    namespace="namespace_b",
+    user_name="用户B",
+    business_id="test_7"
+))
+
+
+# 可重入测试的申请锁请求体模板，按 business_id 替换占位符即可复用
+_REENTRANT_ACQUIRE_TEMPLATE = _dumps(LockServiceClient._acquire_payload(
+    user_id="user_reentrant",
+    user_name="可重入用户",
+    business_id="__BID__",
+    timeout=60
+))
 
 
 class TestRunner:
     """测试运行器"""
+    __test__ = False
+    
+    # 全部测试用例的方法名，按执行顺序排列
+    TEST_CASES = (
+        "test_1_basic_acquire_and_release",
+        "test_2_duplicate_acquire",
+        "test_3_heartbeat",
+        "test_4_lock_timeout",
+        "test_5_release_invalid_lock",
+        "test_6_heartbeat_invalid_lock",
+        "test_7_namespace_isolation",
+        "test_8_default_namespace",
+        "test_9_heartbeat_after_release",
+        "test_10_concurrent_locks",
+        "test_11_reentrant_lock",
+        "test_12_reentrant_lock_different_users",
+    )
     
     def __init__(self, client: LockServiceClient):
         self.client = client
-        self.passed = 0
-        self.failed = 0
+        self._pass_ctr = itertools.count()
+        self._fail_ctr = itertools.count()
+        self._totals: Optional[Tuple[int, int]] = None
+        # 日志由后台线程统一写出，测试线程不必争抢 stdout 锁
+        self._logq = queue.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._drain_log, daemon=True)
+        self._log_thread.start()
+        # 并行运行时每个测试线程先缓存自己的日志，测试结束后整块输出
+        self._tls = threading.local()
+    
+    def _log(self, message: str = ""):
+        """输出一行日志（测试内先缓存，否则放入队列由后台线程写出）"""
+        lines = getattr(self._tls, "lines", None)
+        if lines is not None:
+            lines.append(message)
+        elif self._log_thread.is_alive():
+            self._logq.put(message)
+        else:
+            # 后台线程已结束，直接写出，避免日志被静默丢弃
+            sys.stdout.write(message + "\n")
+    
+    def _run_test(self, test_method) -> List[str]:
+        """在当前线程运行单个测试，返回该测试缓存的全部日志行"""
+        lines = self._tls.lines = []
+        try:
+            test_method()
+        except Exception as e:
+            lines.append(f"❌ 测试异常: {e}")
+            self._record(False)
+        finally:
+            self._tls.lines = None
+        return lines
+    
+    def _drain_log(self):
+        """后台线程：依次写出队列中的日志，遇到 None 结束"""
+        while True:
+            message = self._logq.get()
+            if message is None:
+                break
+            sys.stdout.write(message + "\n")
+        sys.stdout.flush()
+    
+    def _close_log(self):
+        """写完剩余日志并结束后台线程"""
+        if self._log_thread.is_alive():
+            self._logq.put(None)
+            self._log_thread.join()
+    
+    def _record(self, success: bool):
+        """记录一次断言结果（next() 在 GIL 下是原子操作，并行测试无需加锁）"""
+        next(self._pass_ctr if success else self._fail_ctr)
+    
+    def _results(self) -> Tuple[int, int]:
+        """读取通过/失败数（读取会推进计数器，因此只读取一次并缓存结果）"""
+        if self._totals is None:
+            self._totals = (next(self._pass_ctr), next(self._fail_ctr))
+        return self._totals
     
     def assert_response(self, response: Dict[str, Any], expected_success: bool, test_name: str):
         """断言响应"""
         if response.get("success") == expected_success:
-            print(f"✅ {test_name}: PASSED")
-            self.passed += 1
+            self._log(f"✅ {test_name}: PASSED")
+            self._record(True)
         else:
-            print(f"❌ {test_name}: FAILED")
-            print(f"   Expected success={expected_success}, got {response}")
-            self.failed += 1
+            self._log(f"❌ {test_name}: FAILED")
+            self._log(f"   Expected success={expected_success}, got {response}")
+            self._record(False)
     
     def test_1_basic_acquire_and_release(self):
         """测试1：基本的申请锁和释放锁"""
-        print("\n=== 测试1：基本的申请锁和释放锁 ===")
+        self._log("\n=== 测试1：基本的申请锁和释放锁 ===")
         
         # 申请锁
         response = self.client.acquire_lock(business_id="test_1")
@@ -93,7 +298,7 @@ class TestRunner:
         
         if response.get("success"):
             lock_id = response["data"]["lock_id"]
-            print(f"   获取到 lock_id: {lock_id}")
+            self._log(f"   获取到 lock_id: {lock_id}")
             
             # 释放锁
             response = self.client.release_lock(lock_id)
@@ -101,7 +306,7 @@ class TestRunner:
     
     def test_2_duplicate_acquire(self):
         """测试2：不同用户重复申请同一个锁（应该失败）"""
-        print("\n=== 测试2：不同用户重复申请同一个锁 ===")
+        self._log("\n=== 测试2：不同用户重复申请同一个锁 ===")
         
         # 第一次申请
         response1 = self.client.acquire_lock(
@@ -123,11 +328,11 @@ class TestRunner:
         if response1.get("success"):
             lock_id = response1["data"]["lock_id"]
             self.client.release_lock(lock_id)
-            print("   已清理锁")
+            self._log("   已清理锁")
     
     def test_3_heartbeat(self):
         """测试3：心跳续期"""
-        print("\n=== 测试3：心跳续期 ===")
+        self._log("\n=== 测试3：心跳续期 ===")
         
         # 申请锁
         response = self.client.acquire_lock(business_id="test_3", timeout=10)
@@ -140,21 +345,22 @@ class TestRunner:
             response = self.client.heartbeat(lock_id)
             self.assert_response(response, True, "第一次心跳")
             
-            # 等待2秒后再次心跳
-            time.sleep(2)
+            # 稍等片刻后再次心跳
+            time.sleep(0.5)
             response = self.client.heartbeat(lock_id)
             self.assert_response(response, True, "第二次心跳")
             
             # 清理
             self.client.release_lock(lock_id)
-            print("   已清理锁")
+            self._log("   已清理锁")
     
     def test_4_lock_timeout(self):
         """测试4：锁超时自动释放"""
-        print("\n=== 测试4：锁超时自动释放 ===")
+        self._log("\n=== 测试4：锁超时自动释放 ===")
         
         # 申请一个短超时的锁
         response = self.client.acquire_lock(
+            user_id="user_a",
             user_name="用户A",
             business_id="test_4",
             timeout=3
@@ -163,55 +369,53 @@ class TestRunner:
         
         if response.get("success"):
             lock_id = response["data"]["lock_id"]
-            print(f"   等待4秒让锁过期...")
-            time.sleep(4)
+            self._log("   轮询等待锁过期（最多4.5秒）...")
             
-            # 尝试再次申请同一个锁（应该成功，因为之前的锁已过期）
-            response = self.client.acquire_lock(
-                user_name="用户B",
-                business_id="test_4"
-            )
+            # 另一个用户轮询申请同一个锁，锁过期后应该成功
+            # （必须使用不同的 user_id，否则会命中可重入逻辑并刷新原锁）
+            deadline = time.monotonic() + 4.5
+            while True:
+                response = self.client.acquire_lock(
+                    user_id="user_b",
+                    user_name="用户B",
+                    business_id="test_4"
+                )
+                if response.get("success") or time.monotonic() >= deadline:
+                    break
+                time.sleep(0.1)
             self.assert_response(response, True, "申请已过期的锁（预期成功）")
             
             # 清理
             if response.get("success"):
                 new_lock_id = response["data"]["lock_id"]
                 self.client.release_lock(new_lock_id)
-                print("   已清理锁")
+                self._log("   已清理锁")
     
     def test_5_release_invalid_lock(self):
         """测试5：释放不存在的锁"""
-        print("\n=== 测试5：释放不存在的锁 ===")
+        self._log("\n=== 测试5：释放不存在的锁 ===")
         
         # 尝试释放一个不存在的锁
-        response = self.client.release_lock("invalid-lock-id-12345")
+        response = self.client.release_raw(_INVALID_LOCK_BODY)
         self.assert_response(response, False, "释放不存在的锁（预期失败）")
     
     def test_6_heartbeat_invalid_lock(self):
         """测试6：给不存在的锁发送心跳"""
-        print("\n=== 测试6：给不存在的锁发送心跳 ===")
+        self._log("\n=== 测试6：给不存在的锁发送心跳 ===")
         
         # 给不存在的锁发送心跳
-        response = self.client.heartbeat("invalid-lock-id-12345")
+        response = self.client.heartbeat_raw(_INVALID_LOCK_BODY)
         self.assert_response(response, False, "不存在的锁心跳（预期失败）")
     
     def test_7_namespace_isolation(self):
         """测试7：命名空间隔离"""
-        print("\n=== 测试7：命名空间隔离 ===")
+        self._log("\n=== 测试7：命名空间隔离 ===")
         
         # 在不同命名空间申请相同 business_id 的锁
-        response1 = self.client.acquire_lock(
-            namespace="namespace_a",
-            user_name="用户A",
-            business_id="test_7"
-        )
+        response1 = self.client.acquire_raw(_NAMESPACE_A_ACQUIRE_BODY)
         self.assert_response(response1, True, "命名空间A申请锁")
         
-        response2 = self.client.acquire_lock(
-            namespace="namespace_b",
-            user_name="用户B",
-            business_id="test_7"
-        )
+        response2 = self.client.acquire_raw(_NAMESPACE_B_ACQUIRE_BODY)
         self.assert_response(response2, True, "命名空间B申请锁（预期成功，不同命名空间）")
         
         # 清理
@@ -219,11 +423,11 @@ class TestRunner:
             self.client.release_lock(response1["data"]["lock_id"])
         if response2.get("success"):
             self.client.release_lock(response2["data"]["lock_id"])
-        print("   已清理锁")
+        self._log("   已清理锁")
     
     def test_8_default_namespace(self):
         """测试8：默认命名空间"""
-        print("\n=== 测试8：默认命名空间 ===")
+        self._log("\n=== 测试8：默认命名空间 ===")
         
         # 不指定 namespace（使用默认值）
         response = self.client.acquire_lock(business_id="test_8")
@@ -232,11 +436,11 @@ class TestRunner:
         if response.get("success"):
             lock_id = response["data"]["lock_id"]
             self.client.release_lock(lock_id)
-            print("   已清理锁")
+            self._log("   已清理锁")
     
     def test_9_heartbeat_after_release(self):
         """测试9：释放后心跳应该失败"""
-        print("\n=== 测试9：释放后心跳应该失败 ===")
+        self._log("\n=== 测试9：释放后心跳应该失败 ===")
         
         # 申请锁
         response = self.client.acquire_lock(business_id="test_9")
@@ -255,91 +459,85 @@ class TestRunner:
     
     def test_10_concurrent_locks(self):
         """测试10：多个不同业务的并发锁"""
-        print("\n=== 测试10：多个不同业务的并发锁 ===")
+        self._log("\n=== 测试10：多个不同业务的并发锁 ===")
         
-        lock_ids = []
+        # 并发申请多个不同业务的锁
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(
+                lambda i: self.client.acquire_lock(
+                    user_name=f"用户{i}",
+                    business_id=f"test_10_business_{i}"
+                ),
+                range(5)
+            ))
         
-        # 申请多个不同业务的锁
-        for i in range(5):
-            response = self.client.acquire_lock(
-                user_name=f"用户{i}",
-                business_id=f"test_10_business_{i}"
-            )
+        lock_ids = []
+        for i, response in enumerate(responses):
             self.assert_response(response, True, f"申请锁 {i+1}/5")
             
             if response.get("success"):
                 lock_ids.append(response["data"]["lock_id"])
         
-        # 释放所有锁
-        for i, lock_id in enumerate(lock_ids):
-            response = self.client.release_lock(lock_id)
+        # 并发释放所有锁
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(self.client.release_lock, lock_ids))
+        
+        for i, response in enumerate(responses):
             if response.get("success"):
-                print(f"   已释放锁 {i+1}/{len(lock_ids)}")
+                self._log(f"   已释放锁 {i+1}/{len(lock_ids)}")
     
     def test_11_reentrant_lock(self):
         """测试11：可重入锁（同一用户重复申请）"""
-        print("\n=== 测试11：可重入锁（同一用户重复申请） ===")
+        self._log("\n=== 测试11：可重入锁（同一用户重复申请） ===")
+        
+        # 三次申请使用同一个请求体，只序列化一次
+        body = _REENTRANT_ACQUIRE_TEMPLATE.replace(b"__BID__", b"test_11")
         
         # 第一次申请锁
-        response1 = self.client.acquire_lock(
-            user_id="user_reentrant",
-            user_name="可重入用户",
-            business_id="test_11",
-            timeout=60
-        )
+        response1 = self.client.acquire_raw(body)
         self.assert_response(response1, True, "第一次申请锁")
         
         if response1.get("success"):
             lock_id_1 = response1["data"]["lock_id"]
-            print(f"   第一次获取的 lock_id: {lock_id_1}")
+            self._log(f"   第一次获取的 lock_id: {lock_id_1}")
             
-            # 同一用户再次申请（应该成功，返回相同的lock_id）
-            response2 = self.client.acquire_lock(
-                user_id="user_reentrant",
-                user_name="可重入用户",
-                business_id="test_11",
-                timeout=60
-            )
+            # 同一用户再申请两次（应该成功，返回相同的lock_id）
+            response2, response3 = (self.client.acquire_raw(body) for _ in range(2))
             self.assert_response(response2, True, "同一用户第二次申请锁（预期成功）")
             
             if response2.get("success"):
                 lock_id_2 = response2["data"]["lock_id"]
-                print(f"   第二次获取的 lock_id: {lock_id_2}")
+                self._log(f"   第二次获取的 lock_id: {lock_id_2}")
                 
                 # 验证两次返回的lock_id相同
                 if lock_id_1 == lock_id_2:
-                    print("   ✅ 验证通过：两次返回相同的lock_id")
-                    self.passed += 1
+                    self._log("   ✅ 验证通过：两次返回相同的lock_id")
+                    self._record(True)
                 else:
-                    print(f"   ❌ 验证失败：两次返回不同的lock_id ({lock_id_1} != {lock_id_2})")
-                    self.failed += 1
+                    self._log(f"   ❌ 验证失败：两次返回不同的lock_id ({lock_id_1} != {lock_id_2})")
+                    self._record(False)
                 
                 # 第三次申请，验证仍然返回相同的lock_id
-                response3 = self.client.acquire_lock(
-                    user_id="user_reentrant",
-                    user_name="可重入用户",
-                    business_id="test_11",
-                    timeout=60
-                )
                 self.assert_response(response3, True, "同一用户第三次申请锁（预期成功）")
                 
                 if response3.get("success"):
                     lock_id_3 = response3["data"]["lock_id"]
                     if lock_id_1 == lock_id_3:
-                        print("   ✅ 验证通过：第三次仍返回相同的lock_id")
+                        self._log("   ✅ 验证通过：第三次仍返回相同的lock_id")
                     else:
-                        print(f"   ❌ 验证失败：第三次返回不同的lock_id")
+                        self._log(f"   ❌ 验证失败：第三次返回不同的lock_id")
                 
                 # 清理
                 self.client.release_lock(lock_id_1)
-                print("   已清理锁")
+                self._log("   已清理锁")
     
     def test_12_reentrant_lock_different_users(self):
         """测试12：可重入锁 - 不同用户不能获取"""
-        print("\n=== 测试12：可重入锁 - 验证不同用户无法获取 ===")
+        self._log("\n=== 测试12：可重入锁 - 验证不同用户无法获取 ===")
         
-        # 用户A申请锁
-        response1 = self.client.acquire_lock(
+        # 用户A连续申请两次
+        response1, response2 = self.client.bulk_acquire(
+            2,
             user_id="user_a",
             user_name="用户A",
             business_id="test_12"
@@ -350,14 +548,10 @@ class TestRunner:
             lock_id_a = response1["data"]["lock_id"]
             
             # 用户A再次申请（应该成功）
-            response2 = self.client.acquire_lock(
-                user_id="user_a",
-                user_name="用户A",
-                business_id="test_12"
-            )
             self.assert_response(response2, True, "用户A再次申请锁（预期成功）")
             
-            # 用户B尝试申请（应该失败）
+            # 用户B尝试申请（应该失败）；只在用户A持有锁时发送，
+            # 否则可能重入并续期上次运行残留的用户B的锁
             response3 = self.client.acquire_lock(
                 user_id="user_b",
                 user_name="用户B",
@@ -367,56 +561,54 @@ class TestRunner:
             
             # 清理
             self.client.release_lock(lock_id_a)
-            print("   已清理锁")
+            self._log("   已清理锁")
+    
+    def run_case(self, name: str) -> Tuple[int, int]:
+        """单独运行一个测试用例（供 pytest 调用），返回 (通过数, 失败数)"""
+        try:
+            getattr(self, name)()
+        finally:
+            self._close_log()
+        return self._results()
     
     def run_all_tests(self):
         """运行所有测试"""
-        print("\n" + "="*60)
-        print("开始运行分布式锁服务集成测试")
-        print("="*60)
-        
-        # 检查服务是否可用
         try:
-            response = requests.get(f"{self.client.config.base_url}/api/lock/acquire")
-        except requests.exceptions.ConnectionError:
-            print("❌ 无法连接到服务，请确保服务已启动在 http://127.0.0.1:8080")
-            return
-        
-        # 运行所有测试
-        test_methods = [
-            self.test_1_basic_acquire_and_release,
-            self.test_2_duplicate_acquire,
-            self.test_3_heartbeat,
-            self.test_4_lock_timeout,
-            self.test_5_release_invalid_lock,
-            self.test_6_heartbeat_invalid_lock,
-            self.test_7_namespace_isolation,
-            self.test_8_default_namespace,
-            self.test_9_heartbeat_after_release,
-            self.test_10_concurrent_locks,
-            self.test_11_reentrant_lock,
-            self.test_12_reentrant_lock_different_users,
-        ]
-        
-        for test_method in test_methods:
-            try:
-                test_method()
-            except Exception as e:
-                print(f"❌ 测试异常: {e}")
-                self.failed += 1
-        
-        # 输出测试结果
-        print("\n" + "="*60)
-        print("测试结果汇总")
-        print("="*60)
-        print(f"✅ 通过: {self.passed}")
-        print(f"❌ 失败: {self.failed}")
-        print(f"总计: {self.passed + self.failed}")
-        
-        if self.failed == 0:
-            print("\n🎉 所有测试通过！")
-        else:
-            print(f"\n⚠️  有 {self.failed} 个测试失败")
+            self._log("\n" + "="*60)
+            self._log("开始运行分布式锁服务集成测试")
+            self._log("="*60)
+            
+            # 检查服务是否可用
+            if not self.client.is_available():
+                self._log(f"❌ 无法连接到服务，请确保服务已启动在 {self.client.config.base_url}")
+                return
+            
+            # 运行所有测试
+            test_methods = [getattr(self, name) for name in self.TEST_CASES]
+            
+            # 各测试使用不同的 business_id，互不干扰，全部同时执行，
+            # 测试3/4 的等待与其他测试重叠；每个测试结束时整块输出其日志
+            with ThreadPoolExecutor(max_workers=len(test_methods)) as executor:
+                futures = [executor.submit(self._run_test, test_method) for test_method in test_methods]
+                for future in as_completed(futures):
+                    self._log("\n".join(future.result()))
+            
+            # 输出测试结果
+            passed, failed = self._results()
+            self._log("\n" + "="*60)
+            self._log("测试结果汇总")
+            self._log("="*60)
+            self._log(f"✅ 通过: {passed}")
+            self._log(f"❌ 失败: {failed}")
+            self._log(f"总计: {passed + failed}")
+            
+            if failed == 0:
+                self._log("\n🎉 所有测试通过！")
+            else:
+                self._log(f"\n⚠️  有 {failed} 个测试失败")
+        finally:
+            # 异常退出（如 KeyboardInterrupt）时也要写完已排队的日志
+            self._close_log()
 
 
 def main():
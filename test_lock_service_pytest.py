@@ -0,0 +1,23 @@
+"""
+pytest 入口：以参数化用例的方式运行 test_lock_service.py 中的集成测试
+
+运行方式：
+    pytest -n auto               # pytest-xdist 多进程并行
+    pytest -m "not slow"         # 跳过需要等待的用例
+"""
+
+import pytest
+
+from test_lock_service import TestRunner
+
+# 需要等待心跳间隔或锁过期的用例
+_SLOW_CASES = {"test_3_heartbeat", "test_4_lock_timeout"}
+
+
+@pytest.mark.parametrize("case", [
+    pytest.param(name, marks=pytest.mark.slow) if name in _SLOW_CASES else name
+    for name in TestRunner.TEST_CASES
+])
+def test_lock_service(runner, case):
+    passed, failed = runner.run_case(case)
+    assert failed == 0, f"{failed} 项断言失败（通过 {passed} 项）"